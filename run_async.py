@@ -6,15 +6,9 @@ CryptoRador异步版本 - 加密货币异常行情监测工具
 入口脚本，用于从项目根目录直接启动异步版本的程序
 """
 
-import os
-import sys
 import argparse
 import logging
 
-# 将项目根目录添加到Python路径
-project_root = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(project_root)
-
 # 导入异步主程序
 from src.async_main import main
 from src.config import settings
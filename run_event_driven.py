@@ -6,15 +6,9 @@ CryptoRador事件驱动版本 - 基于WebSocket的加密货币异常行情监测
 入口脚本，用于从项目根目录直接启动事件驱动版本的程序
 """
 
-import os
-import sys
 import argparse
 import logging
 
-# 将项目根目录添加到Python路径
-project_root = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(project_root)
-
 # 导入事件驱动主程序
 from src.event_driven_main import main
 from src.config import settings
@@ -7,7 +7,6 @@
 当价格差异超过设定阈值时，通过Lark(飞书)发送报警通知。
 """
 
-import os
 import sys
 import time
 import logging
@@ -16,9 +15,6 @@ import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Any
 
-# 确保可以导入src模块
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from src.fetcher.async_data_fetcher import AsyncMarketDataFetcher
 from src.analyzer.perp_exchange_monitor import PerpExchangeMonitor
 from src.notifier.lark_notifier import LarkNotifier
@@ -109,6 +105,8 @@ async def main():
         # 关闭所有连接
         if 'market_fetcher' in locals():
             await market_fetcher.close_all()
+        if 'notifier' in locals():
+            await notifier.aclose()
         
         # 记录运行时间
         total_runtime = time.time() - start_time
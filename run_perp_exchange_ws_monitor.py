@@ -8,7 +8,6 @@
 比起REST API轮询方式，WebSocket订阅更高效，可以实时获取价格变化。
 """
 
-import os
 import sys
 import time
 import logging
@@ -18,9 +17,6 @@ import signal
 from datetime import datetime
 from typing import Dict, List, Any
 
-# 确保可以导入src模块
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from src.fetcher.perp_ws_subscriber import PerpWebSocketSubscriber
 from src.analyzer.perp_exchange_monitor import PerpExchangeMonitor
 from src.notifier.lark_notifier import LarkNotifier
@@ -52,6 +48,7 @@ async def main():
     
     # 初始化WebSocket数据订阅器
     market_subscriber = None
+    notifier = None
     
     try:
         # 初始化WebSocket数据订阅器
@@ -156,6 +153,8 @@ async def main():
                 logger.info("已关闭所有WebSocket连接")
             except Exception as e:
                 logger.error(f"关闭WebSocket连接时出错: {str(e)}")
+        if notifier:
+            await notifier.aclose()
         
         # 记录运行时间
         total_runtime = time.time() - start_time
@@ -6,7 +6,6 @@
 实时监控交易所中现货和期货交易对的价格差异，当价差超过阈值时发送警报
 """
 
-import os
 import sys
 import signal
 import asyncio
@@ -15,10 +14,6 @@ import argparse
 from datetime import datetime
 import time
 
-# 将项目根目录添加到Python路径
-project_root = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(project_root)
-
 from src.config import settings
 from src.fetcher.async_subscription_fetcher import SubscriptionDataFetcher
 from src.analyzer.spot_futures_monitor import SpotFuturesMonitor
@@ -124,9 +119,9 @@ class SubscriptionSpotFuturesMonitor:
                         # 发送通知
                         notification_success = self.notifier.send_notification(filtered_alerts)
                         if notification_success:
-                            logger.info("价差异常通知发送成功")
+                            logger.info("价差异常通知已加入发送队列")
                         else:
-                            logger.error("价差异常通知发送失败")
+                            logger.error("价差异常通知加入发送队列失败")
                 
                 # 计算处理时间并等待到下一个检查间隔
                 process_time = time.time() - start_time
@@ -189,6 +184,9 @@ class SubscriptionSpotFuturesMonitor:
         # 停止数据获取服务
         await self.data_fetcher.stop()
         
+        # 发送队列中剩余的通知并释放HTTP连接
+        await self.notifier.aclose()
+        
         logger.info("监控系统已停止")
     
     def handle_signal(self, sig, frame):
@@ -1,13 +1,8 @@
-import os
-import sys
 import logging
 from typing import Dict, List, Optional, Tuple, Any
 import pandas as pd
 import numpy as np
 
-# 修复导入路径问题
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from src.config import settings
 
 logger = logging.getLogger(__name__)
@@ -1,14 +1,9 @@
-import os
-import sys
 import logging
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
-# 修复导入路径问题
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from src.config import settings
 
 logger = logging.getLogger(__name__)
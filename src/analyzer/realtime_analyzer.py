@@ -1,5 +1,3 @@
-import os
-import sys
 import logging
 import pandas as pd
 import numpy as np
@@ -8,9 +6,6 @@ from datetime import datetime, timedelta
 import asyncio
 import ccxt.pro as ccxtpro
 
-# 修复导入路径问题
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from src.config import settings
 
 logger = logging.getLogger(__name__)
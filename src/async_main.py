@@ -1,4 +1,3 @@
-import os
 import sys
 import signal
 import logging
@@ -7,9 +6,6 @@ import time
 import traceback
 from typing import Dict, List, Any
 
-# 修复导入路径问题
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from src.config import settings
 from src.fetcher.async_data_fetcher import AsyncMarketDataFetcher
 from src.analyzer.market_analyzer import MarketAnalyzer
@@ -96,9 +92,9 @@ class AsyncCryptoRador:
                 logger.info(f"Found {len(abnormal_movements)} abnormal movements, sending notification")
                 notification_success = self.price_notifier.send_notification(abnormal_movements)
                 if notification_success:
-                    logger.info("Price abnormal notification sent successfully")
+                    logger.info("Price abnormal notification queued for sending")
                 else:
-                    logger.error("Failed to send price abnormal notification")
+                    logger.error("Failed to queue price abnormal notification")
             else:
                 logger.info("No abnormal movements detected")
                 
@@ -110,16 +106,16 @@ class AsyncCryptoRador:
                 if settings.SPOT_FUTURES_LARK_WEBHOOK_URL:
                     notification_success = self.spot_futures_notifier.send_notification(spot_futures_alerts)
                     if notification_success:
-                        logger.info("Spot-futures basis notification sent to dedicated channel successfully")
+                        logger.info("Spot-futures basis notification queued for dedicated channel")
                     else:
-                        logger.error("Failed to send spot-futures basis notification to dedicated channel")
+                        logger.error("Failed to queue spot-futures basis notification for dedicated channel")
                 else:
                     logger.warning("SPOT_FUTURES_LARK_WEBHOOK_URL not configured, using default notification channel")
                     notification_success = self.price_notifier.send_notification(spot_futures_alerts)
                     if notification_success:
-                        logger.info("Spot-futures basis notification sent to default channel successfully")
+                        logger.info("Spot-futures basis notification queued for default channel")
                     else:
-                        logger.error("Failed to send spot-futures basis notification to default channel")
+                        logger.error("Failed to queue spot-futures basis notification for default channel")
             else:
                 logger.info("No abnormal spot-futures basis detected")
                 
@@ -181,6 +177,10 @@ class AsyncCryptoRador:
         try:
             # 关闭所有交易所连接
             await self.data_fetcher.close_all()
+            
+            # 发送队列中剩余的通知并释放HTTP连接
+            await self.price_notifier.aclose()
+            await self.spot_futures_notifier.aclose()
             logger.info("AsyncCryptoRador shutdown complete")
         except Exception as e:
             logger.error(f"Error during shutdown: {str(e)}")
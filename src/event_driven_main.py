@@ -1,4 +1,3 @@
-import os
 import sys
 import signal
 import logging
@@ -7,9 +6,6 @@ import time
 import traceback
 from typing import Dict, List, Any
 
-# 修复导入路径问题
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from src.config import settings
 from src.fetcher.websocket_data_subscriber import WebSocketDataSubscriber
 from src.analyzer.realtime_analyzer import RealtimeMarketAnalyzer
@@ -61,9 +57,9 @@ class EventDrivenCryptoRador:
                 notification_success = self.notifier.send_notification(anomalies)
                 
                 if notification_success:
-                    logger.info(f"Notification sent for {symbol} on {exchange_id}")
+                    logger.info(f"Notification queued for {symbol} on {exchange_id}")
                 else:
-                    logger.error(f"Failed to send notification for {symbol} on {exchange_id}")
+                    logger.error(f"Failed to queue notification for {symbol} on {exchange_id}")
             except Exception as e:
                 logger.error(f"Exception when sending notification for {symbol} on {exchange_id}: {str(e)}")
     
@@ -144,6 +140,9 @@ class EventDrivenCryptoRador:
             # 显式清理资源，帮助垃圾回收
             self.data_subscriber = None
             
+            # 发送队列中剩余的通知并释放HTTP连接
+            await self.notifier.aclose()
+            
             # 等待一小段时间以确保所有资源都被释放
             await asyncio.sleep(1.0)
             
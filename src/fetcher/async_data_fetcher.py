@@ -1,5 +1,3 @@
-import os
-import sys
 import time
 import logging
 import asyncio
@@ -9,9 +7,6 @@ import ccxt
 import pandas as pd
 from datetime import datetime, timedelta
 
-# 修复导入路径问题
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from src.config import settings
 
 logger = logging.getLogger(__name__)
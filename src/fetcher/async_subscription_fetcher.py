@@ -1,5 +1,3 @@
-import os
-import sys
 import logging
 import asyncio
 from typing import Dict, List, Optional, Tuple, Any, Set
@@ -7,9 +5,6 @@ import ccxt.pro as ccxtpro
 import pandas as pd
 from datetime import datetime, timedelta
 
-# 修复导入路径问题
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from src.config import settings
 
 logger = logging.getLogger(__name__)
@@ -1,5 +1,3 @@
-import os
-import sys
 import logging
 import asyncio
 from typing import Dict, List, Set, Optional, Callable, Any, Tuple
@@ -9,9 +7,6 @@ from datetime import datetime, timedelta
 import re
 import time
 
-# 修复导入路径问题
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from src.config import settings
 
 logger = logging.getLogger(__name__)
@@ -1,5 +1,3 @@
-import os
-import sys
 import time
 import logging
 import asyncio
@@ -10,9 +8,6 @@ import pandas as pd
 from datetime import datetime, timedelta
 import json
 
-# 修复导入路径问题
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from src.config import settings
 
 logger = logging.getLogger(__name__)
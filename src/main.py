@@ -1,13 +1,9 @@
-import os
 import signal
 import logging
 import sys
 import time
 from typing import Dict, List, Any
 
-# 修复导入路径问题
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from src.config import settings
 from src.fetcher.data_fetcher import MarketDataFetcher
 from src.analyzer.market_analyzer import MarketAnalyzer
@@ -98,6 +94,7 @@ class CryptoRador:
             
         logger.info("Stopping CryptoRador market scanner...")
         self.scheduler.stop()
+        self.notifier.close()
         self.running = False
         logger.info("Scanner stopped")
 
@@ -1,28 +1,211 @@
-import os
-import sys
 import json
 import logging
 import time
 import hmac
-import hashlib
 import base64
-import urllib.parse
-from typing import Dict, List, Any, Optional
+import functools
+import heapq
+import operator
+import queue
+import threading
+from collections import ChainMap, OrderedDict
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 import requests
-from datetime import datetime
-import numpy as np
-import pandas as pd
-
-# 修复导入路径问题
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.config import settings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    import aiohttp
+
 logger = logging.getLogger(__name__)
 
+
+def _text_dict(content: str) -> Dict[str, str]:
+    """生成lark_md文本对象，作为卡片div元素的text字段"""
+    return {"tag": "lark_md", "content": content}
+
+
+# 卡片中固定不变的关键词元素(飞书机器人的关键词校验依赖这些文本)，只构建一次并在每条消息中复用
+_MARKET_ALERT_FOOTER = {"tag": "div", "text": _text_dict("_crypto market alert_")}
+_SPOT_FUTURES_ALERT_FOOTER = {"tag": "div", "text": _text_dict("_spot futures basis alert_")}
+_PERP_EXCHANGE_ALERT_FOOTER = {"tag": "div", "text": _text_dict("_crypto exchange arbitrage alert_")}
+_SPOT_FUTURES_SUMMARY_FOOTER = {"tag": "div", "text": _text_dict("_spot futures basis alerts_")}
+_PERP_EXCHANGE_SUMMARY_FOOTER = {"tag": "div", "text": _text_dict("_crypto exchange arbitrage alerts_")}
+
+# 文本通知中每条警报的格式模板，预先拼好后通过str.format_map一次性填充
+_PERP_ALERT_TEXT_FMT = (
+    "💰 交易对: {symbol}\n"
+    "📊 价差: {price_diff:.4f}%\n"
+    "📈 {exchange1}: {price1:.8f} (24h成交量: {volume1})\n"
+    "📉 {exchange2}: {price2:.8f} (24h成交量: {volume2})\n"
+    "⏰ 时间: {timestamp}\n"
+    + "=" * 30 + "\n"
+)
+_PRICE_ALERT_TEXT_FMT = (
+    "🔔 {exchange} | {symbol}\n"
+    "📊 价格变动: {price_change:.2f}%\n"
+    "⏰ 时间: {timestamp}\n"
+    "💰 当前价格: {current_price:.8f}\n"
+    "📈 成交量比: {volume_ratio:.2f}x\n"
+    + "=" * 30 + "\n"
+)
+# 现货-期货价差汇总卡片的行模板
+_SPOT_FUTURES_SUMMARY_ROW_FMT = (
+    "{i}. **{exchange}** | 现货: {spot_symbol} | 期货: {future_symbol} | "
+    "基差: {price_difference_percent:.4f}%"
+).format_map
+# 跨所永续合约价差汇总卡片的表头和行模板
+_PERP_SUMMARY_TABLE_HEADER = "| 基础币种 | 交易所 | 价格差异 | 交易量 | 套利方向 |\n| ---- | ---- | ---- | ---- | ---- |"
+_PERP_SUMMARY_ROW_FMT = (
+    "| {base_symbol} | {exchange1}/{exchange2} | {price_difference_percent:.4f}% | "
+    "{formatted_volume1}/{formatted_volume2} | {higher_exchange} ➔ {lower_exchange} |"
+).format_map
+# 跨所永续合约价差警报在文本模板中必须存在的字段
+_PERP_ALERT_REQUIRED_KEYS = ('symbol', 'price_diff', 'exchange1', 'exchange2', 'price1', 'price2', 'timestamp')
+# 跨所永续合约价差警报中必须为数值的字段(模板中按浮点数格式化)
+_PERP_ALERT_NUMERIC_KEYS = ('price_diff', 'price1', 'price2')
+# 价格变动警报缺失字段时使用的默认值
+_PRICE_ALERT_TEXT_DEFAULTS = {
+    'exchange': 'Unknown',
+    'symbol': 'Unknown',
+    'price_change': 0,
+    'timestamp': '',
+    'current_price': 0,
+    'volume_ratio': 0,
+}
+
+# 各类卡片缺失字段时使用的默认值，格式化前与警报合并一次，之后直接按键取值
+_MOVEMENT_CARD_DEFAULTS = {
+    'exchange': 'Unknown',
+    'symbol': 'Unknown',
+    'timestamp': '',
+    'current_price': 0.0,
+    'price_change_percent': 0.0,
+    'volume_ratio': 0.0,
+    'notes': '',
+    'price_percentile': None,
+    '30d_high': None,
+    '30d_low': None,
+}
+# 常规价格波动卡片按上面默认值的键顺序一次性取出所有字段
+_MOVEMENT_KEYS = tuple(_MOVEMENT_CARD_DEFAULTS)
+_get_movement_fields = operator.itemgetter(*_MOVEMENT_KEYS)
+_SPOT_FUTURES_CARD_DEFAULTS = {
+    'exchange': 'Unknown',
+    'spot_symbol': 'Unknown',
+    'future_symbol': 'Unknown',
+    'spot_price': 0.0,
+    'future_price': 0.0,
+    'price_difference_percent': 0.0,
+    'timestamp': '',
+    'notes': '',
+}
+_PERP_EXCHANGE_CARD_DEFAULTS = {
+    'base_symbol': 'Unknown',
+    'exchange1': 'Unknown',
+    'exchange2': 'Unknown',
+    'symbol1': 'Unknown',
+    'symbol2': 'Unknown',
+    'price1': 0.0,
+    'price2': 0.0,
+    'volume1': 0.0,
+    'volume2': 0.0,
+    'price_difference_percent': 0.0,
+    'higher_exchange': 'Unknown',
+    'lower_exchange': 'Unknown',
+    'timestamp': '',
+    'notes': '',
+}
+
+# 文本消息请求体中固定不变的部分预先序列化，每次只需序列化消息文本并拼接
+_TEXT_PAYLOAD_HEAD = b'{"msg_type":"text","content":{"text":'
+_TEXT_PAYLOAD_TAIL = b'}}'
+_TEXT_PAYLOAD_SIGNED_TAIL = b'},"timestamp":"%d","sign":"%s"}'
+
+# 百分位条长度固定，所有可能的条形(共21种)和刻度在模块加载时预先生成
+_PCT_BAR_LENGTH = 20
+# 百分位(0-100)到条形位置(0-20)的换算系数
+_PCT_BAR_SCALE = _PCT_BAR_LENGTH / 100
+# 使用不同的符号表示程度
+_PCT_BARS = tuple("▁" * p + "△" + "▁" * (_PCT_BAR_LENGTH - p - 1) for p in range(_PCT_BAR_LENGTH + 1))
+# 在条形图下添加刻度
+_PCT_SCALE = "0%" + "─" * (_PCT_BAR_LENGTH // 2 - 2) + "50%" + "─" * (_PCT_BAR_LENGTH // 2 - 2) + "100%"
+
+
+def _dumps(payload: Any) -> bytes:
+    """将请求体(或其中的一个值)序列化为UTF-8 JSON字节串，优先使用orjson"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+def _is_number(value: Any) -> bool:
+    """判断字段是否为可按浮点数格式化的数值(bool除外)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _movement_magnitude(movement: Dict[str, Any]) -> float:
+    """警报的幅度(价差或价格变动百分比的绝对值)，字段缺失或不是数值时视为0"""
+    if 'price_diff' in movement:
+        value = movement.get('price_diff')
+    else:
+        value = movement.get('price_change_percent', movement.get('price_change'))
+    return abs(value) if _is_number(value) else 0.0
+
+
+@functools.lru_cache(maxsize=8)
+def _compute_sign(timestamp: int, secret: bytes) -> str:
+    """按飞书签名规则计算签名，同一时间戳的多条通知直接复用缓存结果
+    
+    Args:
+        timestamp: 秒级时间戳
+        secret: UTF-8编码后的飞书机器人签名密钥
+        
+    Returns:
+        Base64编码的签名
+    """
+    # 飞书官方示例代码：以"时间戳\n密钥"作为HMAC密钥，消息体为空
+    key = '{}\n'.format(timestamp).encode('utf-8') + secret
+    hmac_code = hmac.digest(key, b'', 'sha256')
+    return base64.b64encode(hmac_code).decode('ascii')
+
+
 class LarkNotifier:
     """Sends notifications to Lark (Feishu) group chat."""
     
+    # 相同内容的通知在该时间窗口内只发送一次(秒)
+    DUPLICATE_SUPPRESS_SECONDS = 60
+    # 用于去重的最近消息指纹数量上限
+    MAX_RECENT_MESSAGES = 64
+    # 后台线程收到第一批警报后，在该时间窗口(秒)内到达的警报会合并为一条通知发送
+    COALESCE_WINDOW_SECONDS = 0.2
+    # 签名时间戳按该粒度(秒)对齐，同一时间段内的通知复用同一个签名；飞书允许时间戳与当前时间相差1小时以内
+    SIGN_TIMESTAMP_BUCKET_SECONDS = 30
+    
+    # test_notification使用的测试数据中固定不变的字段(只读)
+    _TEST_MOVEMENT_TEMPLATE = MappingProxyType({
+        'exchange': 'TEST',
+        'symbol': 'BTC/USDT',
+        'current_price': 50000.0,
+        'reference_price': 48000.0,
+        'price_change_percent': 4.17,
+        'current_volume': 1000000.0,
+        'average_volume': 500000.0,
+        'volume_change_ratio': 2.0,
+        'volume_ratio': 2.0,
+        'is_future': False,
+        # 添加测试消息备注
+        'notes': "测试消息 - 验证飞书通知功能是否正常"
+    })
+    
     def __init__(self, webhook_url: Optional[str] = None, secret: Optional[str] = None):
         """Initialize the Lark notifier.
         
@@ -32,6 +215,215 @@ class LarkNotifier:
         """
         self.webhook_url = webhook_url or settings.LARK_WEBHOOK_URL
         self.secret = secret or settings.LARK_SECRET
+        self._secret_bytes = self.secret.encode('utf-8') if self.secret else b''
+        # 配置在构造时确定，之后每次发送只检查这个标志
+        self._enabled = bool(self.webhook_url)
+        if not self._enabled:
+            logger.warning("未配置Lark webhook URL，Lark通知将被跳过")
+        
+        # 复用同一个HTTP会话，保持keep-alive连接，避免每次通知都重新进行TCP+TLS握手
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=3,
+                connect=2,
+                read=2,
+                backoff_factor=0.25,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(['POST']),
+                raise_on_status=False
+            )
+        )
+        self._session.mount('https://', adapter)
+        self._session.headers.update({'Content-Type': 'application/json'})
+        
+        # 通知由后台线程发送，调用方(扫描/检测循环)不再被webhook的网络往返阻塞
+        self._queue: "queue.Queue[Optional[List[Dict[str, Any]]]]" = queue.Queue(maxsize=256)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        # 已入队但尚未处理完的警报列表数量，flush()通过条件变量等待其归零
+        self._pending = 0
+        self._pending_cond = threading.Condition()
+        
+        # 最近发送消息的指纹 -> 发送时间(monotonic)，用于抑制冷却期内的重复通知
+        self._recent_messages: "OrderedDict[int, float]" = OrderedDict()
+        self._recent_lock = threading.Lock()
+        
+        # 供异步调用方使用的aiohttp会话，在事件循环中首次发送时创建
+        self._aio_session: Optional["aiohttp.ClientSession"] = None
+        
+        # 按alert_type分派卡片格式化方法，未登记的类型(常规价格波动)使用默认卡片
+        self._formatters = {
+            'spot_futures_basis': self._get_spot_futures_card_content,
+            'perp_exchange_difference': self._get_perp_exchange_card_content,
+        }
+    
+    def close(self) -> None:
+        """Send any queued notifications, stop the worker and release the pooled HTTP connections."""
+        with self._worker_lock:
+            worker, self._worker = self._worker, None
+        if worker is not None and worker.is_alive():
+            self._queue.put(None)
+            worker.join(timeout=30)
+        self._session.close()
+    
+    async def aclose(self) -> None:
+        """Async counterpart of close() for callers running inside an event loop.
+        
+        Closes the aiohttp session used by send_notification_async, then runs close() in the
+        default executor: it waits for the background sender to drain, which must not block the loop.
+        """
+        import asyncio
+        
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()
+        self._aio_session = None
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+    
+    def __enter__(self) -> "LarkNotifier":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued notification has been sent.
+        
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+            
+        Returns:
+            True if the queue was drained, False if the timeout expired first
+        """
+        with self._pending_cond:
+            return self._pending_cond.wait_for(lambda: self._pending == 0, timeout)
+    
+    def _ensure_worker(self) -> None:
+        """Start the background sender thread on first use."""
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._drain, name="LarkNotifier", daemon=True)
+                self._worker.start()
+    
+    def _drain(self) -> None:
+        """Worker loop: coalesce alerts queued within a short window and post them as one message."""
+        while True:
+            alerts = self._queue.get()
+            if alerts is None:
+                return
+            
+            batch = list(alerts)
+            taken = 1
+            stopping = False
+            deadline = time.monotonic() + self.COALESCE_WINDOW_SECONDS
+            try:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        alerts = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if alerts is None:
+                        stopping = True
+                        break
+                    taken += 1
+                    batch.extend(alerts)
+                
+                self._deliver(batch)
+            finally:
+                self._mark_done(taken)
+            
+            if stopping:
+                return
+    
+    def _mark_done(self, count: int) -> None:
+        """Mark queued alert lists as processed and wake flush() waiters once nothing is pending."""
+        with self._pending_cond:
+            self._pending -= count
+            if self._pending == 0:
+                self._pending_cond.notify_all()
+    
+    def _deliver(self, alerts: List[Dict[str, Any]]) -> bool:
+        """Format alerts into one message and post it, unless it duplicates a recent one.
+        
+        Args:
+            alerts: 已校验的警报信息列表
+            
+        Returns:
+            True if the message was sent or suppressed as a duplicate, False otherwise
+        """
+        try:
+            message = self._build_text_message(alerts)
+        except Exception as e:
+            logger.error("构建Lark通知消息时出错: %s", e)
+            return False
+        if not message:
+            return False
+        
+        # 冷却期内内容完全相同的通知不再重复发送
+        if self._is_duplicate(message):
+            logger.info("相同内容的Lark通知已在%d秒内发送过，跳过本次发送", self.DUPLICATE_SUPPRESS_SECONDS)
+            return True
+        
+        if not self._send_to_lark(message):
+            return False
+        self._record_sent(message)
+        return True
+    
+    def _is_duplicate(self, message: str) -> bool:
+        """Check whether an identical message was sent successfully within the cooldown.
+        
+        Args:
+            message: 要发送的消息
+            
+        Returns:
+            True if the same message was sent within DUPLICATE_SUPPRESS_SECONDS
+        """
+        now = time.monotonic()
+        with self._recent_lock:
+            sent_at = self._recent_messages.get(hash(message))
+        return sent_at is not None and now - sent_at < self.DUPLICATE_SUPPRESS_SECONDS
+    
+    def _record_sent(self, message: str) -> None:
+        """Remember a message Lark accepted, so identical ones are suppressed during the cooldown.
+        
+        只在发送成功后调用，发送失败的消息不会被记录，重试时仍会真正发送。
+        
+        Args:
+            message: 已成功发送的消息
+        """
+        key = hash(message)
+        now = time.monotonic()
+        with self._recent_lock:
+            self._recent_messages[key] = now
+            self._recent_messages.move_to_end(key)
+            while len(self._recent_messages) > self.MAX_RECENT_MESSAGES:
+                self._recent_messages.popitem(last=False)
+    
+    def _enqueue(self, alerts: List[Dict[str, Any]]) -> bool:
+        """Hand alerts to the background sender.
+        
+        Args:
+            alerts: 已校验的警报信息列表
+            
+        Returns:
+            True if the alerts were queued, False if the queue is full
+        """
+        self._ensure_worker()
+        # 先计数再入队，保证flush()不会在后台线程处理前提前返回
+        with self._pending_cond:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(alerts)
+        except queue.Full:
+            self._mark_done(1)
+            logger.error("Lark通知队列已满，丢弃本条通知")
+            return False
+        return True
     
     def _generate_sign(self, timestamp: int) -> str:
         """Generate signature for Lark webhook.
@@ -42,26 +434,23 @@ class LarkNotifier:
         Returns:
             Base64 encoded signature
         """
-        if not self.secret:
+        if not self._secret_bytes:
             return ""
         
-        # 将timestamp转为字符串
-        timestamp_str = str(timestamp)
-        
-        # 飞书官方示例代码（使用时间戳+换行符+密钥作为字符串）
-        string_to_sign = '{}\n{}'.format(timestamp_str, self.secret)
-        
-        # 使用HMAC-SHA256计算签名
-        hmac_code = hmac.new(
-            string_to_sign.encode("utf-8"),  # 使用"时间戳\n密钥"作为密钥
-            digestmod=hashlib.sha256
-        ).digest()
-        
-        # Base64编码
-        sign = base64.b64encode(hmac_code).decode('utf-8')
+        # 签名属于凭据，不写入日志；如需在本地校验签名，应使用hmac.compare_digest而不是==
+        return _compute_sign(timestamp, self._secret_bytes)
+    
+    @staticmethod
+    def _md_div(content: str) -> Dict[str, Any]:
+        """生成单个lark_md文本元素，多行内容用换行连接后放入同一个元素，飞书会逐行渲染
         
-        logger.debug(f"Generated sign for timestamp {timestamp}: {sign}")
-        return sign
+        Args:
+            content: markdown文本
+            
+        Returns:
+            卡片元素字典
+        """
+        return {"tag": "div", "text": _text_dict(content)}
     
     def _get_card_content(self, movement: dict) -> dict:
         """Generate card content for Lark notification.
@@ -72,125 +461,52 @@ class LarkNotifier:
         Returns:
             Card content dictionary
         """
-        # 检查是否为现货-期货价差报警
-        if movement.get('alert_type') == 'spot_futures_basis':
-            return self._get_spot_futures_card_content(movement)
-        # 检查是否为跨所永续合约价差报警
-        elif movement.get('alert_type') == 'perp_exchange_difference':
-            return self._get_perp_exchange_card_content(movement)
-            
-        logger.debug(f"Formatting card message for one abnormal movement: {movement}")
-        
-        exchange = movement.get('exchange', 'Unknown')
-        symbol = movement.get('symbol', 'Unknown')
-        timestamp = movement.get('timestamp', '')
-        current_price = movement.get('current_price', 0.0)
-        price_change = movement.get('price_change_percent', 0.0)
-        volume_ratio = movement.get('volume_ratio', 0.0)
-        notes = movement.get('notes', '')
-        
-        # 价格分位数信息
-        price_percentile = movement.get('price_percentile', None)
-        price_30d_high = movement.get('30d_high', None)
-        price_30d_low = movement.get('30d_low', None)
-        price_30d_avg = movement.get('30d_avg', None)
+        return self._formatters.get(movement.get('alert_type'), self._get_default_card_content)(movement)
+    
+    def _get_default_card_content(self, movement: dict) -> dict:
+        """生成常规价格波动报警的卡片内容
+        
+        Args:
+            movement: 异常波动字典
+            
+        Returns:
+            卡片内容字典
+        """
+        logger.debug("Formatting card message for one abnormal movement: %r", movement)
+        
+        # 价格分位数信息(price_percentile, 30d_high, 30d_low)也在其中
+        (exchange, symbol, timestamp, current_price, price_change, volume_ratio, notes,
+         price_percentile, price_30d_high, price_30d_low) = _get_movement_fields({**_MOVEMENT_CARD_DEFAULTS, **movement})
         
         color = "red" if price_change > 0 else "green"
         title = f"{exchange} | {symbol} | 价格{'上涨' if price_change > 0 else '下跌'} {abs(price_change):.2f}%"
         
-        elements = [
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**交易所**: {exchange}"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**交易对**: {symbol}"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**时间**: {timestamp}"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**当前价格**: {current_price}"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**价格变动**: {price_change:+.2f}%"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**成交量比**: {volume_ratio:.2f}x"
-                }
-            }
+        lines = [
+            f"**交易所**: {exchange}",
+            f"**交易对**: {symbol}",
+            f"**时间**: {timestamp}",
+            f"**当前价格**: {current_price}",
+            f"**价格变动**: {price_change:+.2f}%",
+            f"**成交量比**: {volume_ratio:.2f}x"
         ]
         
         # 添加价格分位数信息（如果存在）
         if price_percentile is not None:
-            elements.append({
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**30天价格分位**: {price_percentile:.2f}%"
-                }
-            })
+            lines.append(f"**30天价格分位**: {price_percentile:.2f}%")
             
             # 添加一个可视化的分位数指示器
-            percentile_bar = self._create_percentile_bar(price_percentile)
-            elements.append({
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"{percentile_bar}"
-                }
-            })
+            lines.append(self._create_percentile_bar(price_percentile))
             
             # 添加30天高低价信息
             if price_30d_high is not None and price_30d_low is not None:
-                elements.append({
-                    "tag": "div",
-                    "text": {
-                        "tag": "lark_md",
-                        "content": f"**30天价格区间**: {price_30d_low:.2f} - {price_30d_high:.2f}"
-                    }
-                })
+                lines.append(f"**30天价格区间**: {price_30d_low:.2f} - {price_30d_high:.2f}")
         
         # 添加notes字段（如果存在）
         if notes:
-            elements.append({
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**备注**: {notes}"
-                }
-            })
+            lines.append(f"**备注**: {notes}")
             
         # 添加必需的关键词(使用斜体和小字体，不显眼但确保存在)
-        elements.append({
-            "tag": "div",
-            "text": {
-                "tag": "lark_md",
-                "content": f"_crypto market alert_"
-            }
-        })
+        elements = [self._md_div("\n".join(lines)), _MARKET_ALERT_FOOTER]
         
         card = {
             "elements": elements,
@@ -214,92 +530,39 @@ class LarkNotifier:
         Returns:
             卡片内容字典
         """
-        logger.debug(f"Formatting card message for spot-futures basis alert: {alert}")
+        logger.debug("Formatting card message for spot-futures basis alert: %r", alert)
         
-        exchange = alert.get('exchange', 'Unknown')
-        spot_symbol = alert.get('spot_symbol', 'Unknown')
-        future_symbol = alert.get('future_symbol', 'Unknown')
-        spot_price = alert.get('spot_price', 0.0)
-        future_price = alert.get('future_price', 0.0)
-        price_diff = alert.get('price_difference_percent', 0.0)
-        timestamp = alert.get('timestamp', '')
-        notes = alert.get('notes', '')
+        a = {**_SPOT_FUTURES_CARD_DEFAULTS, **alert}
+        exchange = a['exchange']
+        spot_symbol = a['spot_symbol']
+        future_symbol = a['future_symbol']
+        spot_price = a['spot_price']
+        future_price = a['future_price']
+        price_diff = a['price_difference_percent']
+        timestamp = a['timestamp']
+        notes = a['notes']
         
         # 基差超过0表示期货溢价，低于0表示期货贴水
         is_premium = price_diff > 0
         color = "orange"  # 使用橙色区分现货-期货价差报警
         title = f"{exchange} | 现货-期货异常基差 {abs(price_diff):.4f}%"
         
-        elements = [
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**交易所**: {exchange}"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**现货交易对**: {spot_symbol}"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**期货交易对**: {future_symbol}"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**现货价格**: {spot_price}"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**期货价格**: {future_price}"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**基差**: {price_diff:.4f}% ({'期货溢价' if is_premium else '期货贴水'})"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**时间**: {timestamp}"
-                }
-            }
+        lines = [
+            f"**交易所**: {exchange}",
+            f"**现货交易对**: {spot_symbol}",
+            f"**期货交易对**: {future_symbol}",
+            f"**现货价格**: {spot_price}",
+            f"**期货价格**: {future_price}",
+            f"**基差**: {price_diff:.4f}% ({'期货溢价' if is_premium else '期货贴水'})",
+            f"**时间**: {timestamp}"
         ]
         
         # 添加notes字段（如果存在）
         if notes:
-            elements.append({
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**备注**: {notes}"
-                }
-            })
+            lines.append(f"**备注**: {notes}")
             
         # 添加必需的关键词(使用斜体和小字体，不显眼但确保存在)
-        elements.append({
-            "tag": "div",
-            "text": {
-                "tag": "lark_md",
-                "content": f"_spot futures basis alert_"
-            }
-        })
+        elements = [self._md_div("\n".join(lines)), _SPOT_FUTURES_ALERT_FOOTER]
         
         card = {
             "elements": elements,
@@ -323,22 +586,23 @@ class LarkNotifier:
         Returns:
             卡片内容字典
         """
-        logger.debug(f"Formatting card message for cross-exchange perpetual price difference alert: {alert}")
-        
-        base_symbol = alert.get('base_symbol', 'Unknown')
-        exchange1 = alert.get('exchange1', 'Unknown')
-        exchange2 = alert.get('exchange2', 'Unknown')
-        symbol1 = alert.get('symbol1', 'Unknown')
-        symbol2 = alert.get('symbol2', 'Unknown')
-        price1 = alert.get('price1', 0.0)
-        price2 = alert.get('price2', 0.0)
-        volume1 = alert.get('volume1', 0.0)
-        volume2 = alert.get('volume2', 0.0)
-        price_diff = alert.get('price_difference_percent', 0.0)
-        higher_exchange = alert.get('higher_exchange', 'Unknown')
-        lower_exchange = alert.get('lower_exchange', 'Unknown')
-        timestamp = alert.get('timestamp', '')
-        notes = alert.get('notes', '')
+        logger.debug("Formatting card message for cross-exchange perpetual price difference alert: %r", alert)
+        
+        a = {**_PERP_EXCHANGE_CARD_DEFAULTS, **alert}
+        base_symbol = a['base_symbol']
+        exchange1 = a['exchange1']
+        exchange2 = a['exchange2']
+        symbol1 = a['symbol1']
+        symbol2 = a['symbol2']
+        price1 = a['price1']
+        price2 = a['price2']
+        volume1 = a['volume1']
+        volume2 = a['volume2']
+        price_diff = a['price_difference_percent']
+        higher_exchange = a['higher_exchange']
+        lower_exchange = a['lower_exchange']
+        timestamp = a['timestamp']
+        notes = a['notes']
         
         # 格式化交易量，使用适当的单位 (万、亿)
         formatted_volume1 = self._format_large_number(volume1)
@@ -348,83 +612,23 @@ class LarkNotifier:
         color = "purple"
         title = f"{base_symbol} | 跨所永续合约价差 {abs(price_diff):.4f}%"
         
-        elements = [
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**基础交易对**: {base_symbol}"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**交易所1**: {exchange1} ({symbol1})"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**交易所2**: {exchange2} ({symbol2})"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**价格1**: {price1} | **24h交易量**: {formatted_volume1}"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**价格2**: {price2} | **24h交易量**: {formatted_volume2}"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**价格差异**: {price_diff:.4f}%"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**套利方向**: {higher_exchange} ➔ {lower_exchange}"
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**时间**: {timestamp}"
-                }
-            }
+        lines = [
+            f"**基础交易对**: {base_symbol}",
+            f"**交易所1**: {exchange1} ({symbol1})",
+            f"**交易所2**: {exchange2} ({symbol2})",
+            f"**价格1**: {price1} | **24h交易量**: {formatted_volume1}",
+            f"**价格2**: {price2} | **24h交易量**: {formatted_volume2}",
+            f"**价格差异**: {price_diff:.4f}%",
+            f"**套利方向**: {higher_exchange} ➔ {lower_exchange}",
+            f"**时间**: {timestamp}"
         ]
         
         # 添加notes字段（如果存在）
         if notes:
-            elements.append({
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"**备注**: {notes}"
-                }
-            })
+            lines.append(f"**备注**: {notes}")
             
         # 添加必需的关键词(使用斜体和小字体，不显眼但确保存在)
-        elements.append({
-            "tag": "div",
-            "text": {
-                "tag": "lark_md",
-                "content": f"_crypto exchange arbitrage alert_"
-            }
-        })
+        elements = [self._md_div("\n".join(lines)), _PERP_EXCHANGE_ALERT_FOOTER]
         
         card = {
             "elements": elements,
@@ -464,19 +668,11 @@ class LarkNotifier:
         Returns:
             表示百分位的字符串
         """
-        bar_length = 20  # 条的总长度
-        position = int(round(percentile / 100 * bar_length))
-        
-        # 确保位置在有效范围内
-        position = max(0, min(position, bar_length))
-        
-        # 使用不同的符号表示程度
-        bar = "▁" * position + "△" + "▁" * (bar_length - position - 1)
-        
-        # 在条形图下添加刻度
-        scale = "0%"+"─"*(int(bar_length/2)-2)+"50%"+"─"*(int(bar_length/2)-2)+"100%"
+        # 先把百分位限制在0-100之间，之后的位置计算只需一次乘加和取整(四舍五入)
+        percentile = max(0.0, min(percentile, 100.0))
+        position = int(percentile * _PCT_BAR_SCALE + 0.5)
         
-        return f"```\n{bar}\n{scale}\n```"
+        return f"```\n{_PCT_BARS[position]}\n{_PCT_SCALE}\n```"
     
     def format_card_message(self, abnormal_movements: List[Dict[str, Any]]) -> Dict:
         """Format abnormal movements data as a Lark interactive card.
@@ -489,6 +685,9 @@ class LarkNotifier:
         """
         if not abnormal_movements:
             return None
+        
+        if len(abnormal_movements) > 1:
+            abnormal_movements = self._dedupe_movements(abnormal_movements)
             
         # 将通知分组处理
         if len(abnormal_movements) == 1:
@@ -520,6 +719,31 @@ class LarkNotifier:
                 # 这里只显示第一个警报，避免消息过长
                 return self._get_card_content(abnormal_movements[0])
     
+    def _dedupe_movements(self, movements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """同一标的的重复警报只保留幅度最大的一条
+        
+        常规价格波动按(交易所, 交易对)去重，文本通知中的跨所价差警报按(交易对, 交易所1, 交易所2)去重；
+        卡片用的价差类警报(带alert_type)没有这些字段，原样保留。
+        
+        Args:
+            movements: 异常波动列表
+            
+        Returns:
+            去重后的列表，保持首次出现的顺序
+        """
+        seen: Dict[Any, Dict[str, Any]] = {}
+        for movement in movements:
+            if 'price_diff' in movement:
+                key = ('price_diff', movement.get('symbol'), movement.get('exchange1'), movement.get('exchange2'))
+            elif movement.get('alert_type'):
+                key = id(movement)
+            else:
+                key = (movement.get('exchange'), movement.get('symbol'))
+            prev = seen.get(key)
+            if prev is None or _movement_magnitude(movement) > _movement_magnitude(prev):
+                seen[key] = movement
+        return list(seen.values())
+    
     def _format_spot_futures_summary_card(self, alerts: List[Dict[str, Any]]) -> Dict:
         """生成多个现货-期货价差报警的汇总卡片
         
@@ -529,40 +753,14 @@ class LarkNotifier:
         Returns:
             汇总卡片字典
         """
-        elements = []
-        
-        # 添加标题
-        elements.append({
-            "tag": "div",
-            "text": {
-                "tag": "lark_md",
-                "content": f"**检测到 {len(alerts)} 个交易对出现现货-期货价差异常**"
-            }
-        })
+        # 标题和每个报警的简要信息合并为一个lark_md块，避免每条报警单独生成一个div
+        lines = [f"**检测到 {len(alerts)} 个交易对出现现货-期货价差异常**"]
         
-        # 添加每个报警的简要信息
         for i, alert in enumerate(alerts, 1):
-            exchange = alert.get('exchange', 'Unknown')
-            spot_symbol = alert.get('spot_symbol', 'Unknown')
-            future_symbol = alert.get('future_symbol', 'Unknown')
-            price_diff = alert.get('price_difference_percent', 0.0)
-            
-            elements.append({
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"{i}. **{exchange}** | 现货: {spot_symbol} | 期货: {future_symbol} | 基差: {price_diff:.4f}%"
-                }
-            })
+            lines.append(_SPOT_FUTURES_SUMMARY_ROW_FMT({**_SPOT_FUTURES_CARD_DEFAULTS, **alert, 'i': i}))
         
         # 添加必需的关键词
-        elements.append({
-            "tag": "div",
-            "text": {
-                "tag": "lark_md",
-                "content": f"_spot futures basis alerts_"
-            }
-        })
+        elements = [self._md_div("\n".join(lines)), _SPOT_FUTURES_SUMMARY_FOOTER]
         
         card = {
             "elements": elements,
@@ -590,51 +788,29 @@ class LarkNotifier:
         color = "purple"
         title = f"🔄 跨所永续合约价差警报 ({len(alerts)}个)"
         
-        # 按价差绝对值从大到小排序
-        sorted_alerts = sorted(alerts, 
-                               key=lambda x: abs(x.get('price_difference_percent', 0.0)), 
-                               reverse=True)
+        # 只取价差绝对值最大的10条（限制最多显示10条），无需对全部警报排序
+        top_alerts = heapq.nlargest(10, alerts,
+                                    key=lambda x: abs(x.get('price_difference_percent', 0.0)))
         
-        # 创建表格内容
-        table_content = "| 基础币种 | 交易所 | 价格差异 | 交易量 | 套利方向 |\n| ---- | ---- | ---- | ---- | ---- |\n"
+        # 逐行收集表格内容，最后一次性拼接
+        rows = [_PERP_SUMMARY_TABLE_HEADER]
         
-        for alert in sorted_alerts[:10]:  # 限制最多显示10条
-            base_symbol = alert.get('base_symbol', 'Unknown')
-            exchange1 = alert.get('exchange1', 'Unknown')
-            exchange2 = alert.get('exchange2', 'Unknown')
-            price_diff = alert.get('price_difference_percent', 0.0)
-            volume1 = alert.get('volume1', 0.0)
-            volume2 = alert.get('volume2', 0.0)
-            higher_exchange = alert.get('higher_exchange', 'Unknown')
-            lower_exchange = alert.get('lower_exchange', 'Unknown')
+        for alert in top_alerts:
+            a = {**_PERP_EXCHANGE_CARD_DEFAULTS, **alert}
             
             # 格式化交易量
-            formatted_volume1 = self._format_large_number(volume1)
-            formatted_volume2 = self._format_large_number(volume2)
-            volume_display = f"{formatted_volume1}/{formatted_volume2}"
+            a['formatted_volume1'] = self._format_large_number(a['volume1'])
+            a['formatted_volume2'] = self._format_large_number(a['volume2'])
             
-            table_content += f"| {base_symbol} | {exchange1}/{exchange2} | {price_diff:.4f}% | {volume_display} | {higher_exchange} ➔ {lower_exchange} |\n"
+            rows.append(_PERP_SUMMARY_ROW_FMT(a))
             
         # 如果有更多警报，显示提示
         if len(alerts) > 10:
-            table_content += f"\n_还有 {len(alerts) - 10} 个警报未显示..._"
-        
-        elements = [
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": table_content
-                }
-            },
-            {
-                "tag": "div",
-                "text": {
-                    "tag": "lark_md",
-                    "content": f"_crypto exchange arbitrage alerts_"
-                }
-            }
-        ]
+            rows.append(f"\n_还有 {len(alerts) - 10} 个警报未显示..._")
+        
+        table_content = "\n".join(rows)
+        
+        elements = [self._md_div(table_content), _PERP_EXCHANGE_SUMMARY_FOOTER]
         
         card = {
             "elements": elements,
@@ -649,106 +825,201 @@ class LarkNotifier:
         
         return {"msg_type": "interactive", "card": card}
     
-    def send_notification(self, alerts: List[Dict[str, Any]]) -> None:
+    def send_notification(self, alerts: List[Dict[str, Any]], block: bool = False) -> bool:
         """发送通知到Lark
         
+        默认将消息交给后台线程发送，本方法不等待webhook响应。
+        
         Args:
             alerts: 警报信息列表
+            block: 为True时在当前线程直接发送并等待Lark响应
+            
+        Returns:
+            block为False时表示是否成功加入发送队列，为True时表示Lark是否接受了请求
         """
-        if not alerts:
-            return
+        if not alerts or not self._enabled:
+            return False
             
         try:
-            # 构建通知消息
-            message = "🚨 跨所永续合约价差监控警报\n\n"
+            alerts = self._drop_incomplete_alerts(alerts)
+            if not alerts:
+                return False
             
-            # 将警报按价差绝对值从大到小排序
-            sorted_alerts = sorted(alerts, key=lambda x: abs(x.get('price_diff', 0)), reverse=True)
+            if block:
+                return self._deliver(alerts)
+            
+            # 交给后台线程发送到Lark，短时间内的多次调用会被合并为一条消息
+            return self._enqueue(alerts)
+            
+        except Exception as e:
+            logger.error("发送Lark通知时出错: %s", e)
+            return False
+            
+    def _drop_incomplete_alerts(self, alerts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """在格式化前一次性校验警报字段，剔除缺少必需字段或价格字段不是数值的跨所价差警报
+        
+        Args:
+            alerts: 警报信息列表
+            
+        Returns:
+            可以安全格式化的警报列表
+        """
+        valid = []
+        dropped = []
+        for alert in alerts:
+            if 'price_diff' in alert and not (
+                all(key in alert for key in _PERP_ALERT_REQUIRED_KEYS)
+                and all(_is_number(alert[key]) for key in _PERP_ALERT_NUMERIC_KEYS)
+            ):
+                dropped.append(alert)
+            else:
+                valid.append(alert)
+        
+        if dropped:
+            logger.warning("忽略 %d 条字段缺失或无效的跨所价差警报: %r", len(dropped), dropped)
+        return valid
+    
+    def _build_text_message(self, alerts: List[Dict[str, Any]]) -> str:
+        """构建发送到Lark的文本消息
+        
+        Args:
+            alerts: 警报信息列表
             
-            for alert in sorted_alerts:
+        Returns:
+            文本消息内容；没有任何警报能成功格式化时返回空字符串
+        """
+        # 逐段收集通知消息，最后一次性拼接
+        header = "🚨 跨所永续合约价差监控警报\n\n"
+        parts = [header]
+        
+        # 合并发送的警报中同一标的可能出现多次，只保留幅度最大的一条，
+        # 再按价差绝对值从大到小排序（单条警报无需去重和排序）
+        if len(alerts) < 2:
+            sorted_alerts = alerts
+        else:
+            alerts = self._dedupe_movements(alerts)
+            sorted_alerts = sorted(alerts, key=lambda x: abs(x.get('price_diff', 0)), reverse=True)
+        
+        for alert in sorted_alerts:
+            # 合并发送时一条警报格式化失败只跳过它本身，不影响同批次的其他警报
+            try:
                 # 检查是否是跨所永续合约价差警报
                 if 'price_diff' in alert:
-                    # 获取24小时成交量
-                    volume1 = alert.get('volume1', 0)
-                    volume2 = alert.get('volume2', 0)
-                    
-                    # 格式化成交量（转换为万或亿为单位）
-                    def format_volume(volume):
-                        if volume >= 100_000_000:  # 1亿以上
-                            return f"{volume/100_000_000:.2f}亿"
-                        elif volume >= 10_000:  # 1万以上
-                            return f"{volume/10_000:.2f}万"
-                        else:
-                            return f"{volume:.2f}"
+                    # 获取24小时成交量并格式化（转换为万或亿为单位）
+                    volumes = {
+                        'volume1': self._format_large_number(alert.get('volume1', 0)),
+                        'volume2': self._format_large_number(alert.get('volume2', 0)),
+                    }
                     
                     # 跨所永续合约价差格式
-                    message += (
-                        f"💰 交易对: {alert['symbol']}\n"
-                        f"📊 价差: {alert['price_diff']:.4f}%\n"
-                        f"📈 {alert['exchange1']}: {alert['price1']:.8f} (24h成交量: {format_volume(volume1)})\n"
-                        f"📉 {alert['exchange2']}: {alert['price2']:.8f} (24h成交量: {format_volume(volume2)})\n"
-                        f"⏰ 时间: {alert['timestamp']}\n"
-                        f"{'='*30}\n"
-                    )
+                    parts.append(_PERP_ALERT_TEXT_FMT.format_map(ChainMap(volumes, alert)))
                 else:
-                    # 原有的价格变动警报格式
-                    message += (
-                        f"🔔 {alert.get('exchange', 'Unknown')} | {alert.get('symbol', 'Unknown')}\n"
-                        f"📊 价格变动: {alert.get('price_change', 0):.2f}%\n"
-                        f"⏰ 时间: {alert.get('timestamp', '')}\n"
-                        f"💰 当前价格: {alert.get('current_price', 0):.8f}\n"
-                        f"📈 成交量比: {alert.get('volume_ratio', 0):.2f}x\n"
-                        f"{'='*30}\n"
-                    )
-            
-            # 发送到Lark
-            self._send_to_lark(message)
-            
-        except Exception as e:
-            logger.error(f"发送Lark通知时出错: {str(e)}")
-            
-    def _send_to_lark(self, message: str) -> None:
-        """发送消息到Lark
+                    # 原有的价格变动警报格式，缺失字段回退到默认值
+                    parts.append(_PRICE_ALERT_TEXT_FMT.format_map(ChainMap(alert, _PRICE_ALERT_TEXT_DEFAULTS)))
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning("跳过无法格式化的警报: %s - %r", e, alert)
+        
+        if len(parts) == 1:
+            return ""
+        return "".join(parts)
+    
+    def _build_payload(self, message: str) -> bytes:
+        """构建(并在配置了密钥时签名)发送到Lark的请求体
         
         Args:
             message: 要发送的消息
+            
+        Returns:
+            序列化后的JSON请求体
         """
+        text = _dumps(message)
+        if not self._secret_bytes:
+            return b"".join((_TEXT_PAYLOAD_HEAD, text, _TEXT_PAYLOAD_TAIL))
+        
+        # 添加签名(时间戳为数字、签名为Base64，均无需JSON转义)
+        timestamp = int(time.time())
+        timestamp -= timestamp % self.SIGN_TIMESTAMP_BUCKET_SECONDS
+        sign = self._generate_sign(timestamp).encode('ascii')
+        return b"".join((_TEXT_PAYLOAD_HEAD, text, _TEXT_PAYLOAD_SIGNED_TAIL % (timestamp, sign)))
+    
+    async def send_notification_async(self, alerts: List[Dict[str, Any]]) -> bool:
+        """在事件循环中发送通知到Lark，不阻塞事件循环也不经过后台线程
+        
+        Args:
+            alerts: 警报信息列表
+            
+        Returns:
+            True if Lark accepted the request (or it was a suppressed duplicate), False otherwise
+        """
+        if not alerts or not self._enabled:
+            return False
+        
         try:
-            # 构建请求数据
-            data = {
-                "msg_type": "text",
-                "content": {
-                    "text": message
-                }
-            }
+            alerts = self._drop_incomplete_alerts(alerts)
+            if not alerts:
+                return False
+            
+            message = self._build_text_message(alerts)
+            if not message:
+                return False
+            
+            # 冷却期内内容完全相同的通知不再重复发送
+            if self._is_duplicate(message):
+                logger.info("相同内容的Lark通知已在%d秒内发送过，跳过本次发送", self.DUPLICATE_SUPPRESS_SECONDS)
+                return True
+            
+            if self._aio_session is None or self._aio_session.closed:
+                # aiohttp只在异步发送时才导入，只用同步接口的进程无需承担其导入开销
+                import aiohttp
+                self._aio_session = aiohttp.ClientSession(
+                    headers={'Content-Type': 'application/json'},
+                    timeout=aiohttp.ClientTimeout(total=10)
+                )
             
-            # 添加签名
-            if self.secret:
-                timestamp = str(int(time.time()))
-                string_to_sign = f"{timestamp}\n{self.secret}"
-                signature = hmac.new(
-                    self.secret.encode('utf-8'),
-                    string_to_sign.encode('utf-8'),
-                    digestmod=hashlib.sha256
-                ).hexdigest()
+            async with self._aio_session.post(self.webhook_url, data=self._build_payload(message)) as response:
+                if response.status == 200:
+                    # 飞书在签名校验失败等情况下同样返回HTTP 200，需要再检查返回的code
+                    body = await response.json(content_type=None)
+                    if body.get('code', 0) == 0:
+                        self._record_sent(message)
+                        return True
+                logger.error("发送Lark通知失败: %s - %s", response.status, await response.text())
+                return False
                 
-                data["timestamp"] = timestamp
-                data["sign"] = signature
+        except Exception as e:
+            logger.error("发送Lark通知时出错: %s", e)
+            return False
+    
+    def _send_to_lark(self, message: str) -> bool:
+        """发送消息到Lark
+        
+        Args:
+            message: 要发送的消息
             
+        Returns:
+            True if Lark accepted the request, False otherwise
+        """
+        try:
             # 发送请求
-            response = requests.post(
+            response = self._session.post(
                 self.webhook_url,
-                json=data,
+                data=self._build_payload(message),
                 headers={'Content-Type': 'application/json'},
-                timeout=5
+                timeout=(3.05, 10)
             )
             
-            # 检查响应
-            if response.status_code != 200:
-                logger.error(f"发送Lark通知失败: {response.status_code} - {response.text}")
+            # 检查响应，只在失败分支才解码响应正文
+            if response.status_code == 200:
+                # 飞书在签名校验失败等情况下同样返回HTTP 200，需要再检查返回的code
+                code = response.json().get('code', 0)
+                if code == 0:
+                    return True
+            logger.error("发送Lark通知失败: %s - %s", response.status_code, response.text)
+            return False
                 
         except Exception as e:
-            logger.error(f"发送Lark通知时出错: {str(e)}")
+            logger.error("发送Lark通知时出错: %s", e)
+            return False
 
     def test_notification(self) -> bool:
         """Send a test notification to verify Lark webhook configuration works.
@@ -759,27 +1030,17 @@ class LarkNotifier:
         logger.info("Sending test notification to Lark")
         
         try:
-            # Create a simple test movement
+            # Create a simple test movement from the static template plus the time-dependent fields,
+            # both derived from a single clock reading
+            now = time.time()
             test_movement = {
-                'exchange': 'TEST',
-                'symbol': 'BTC/USDT',
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'current_price': 50000.0,
-                'reference_price': 48000.0,
-                'price_change_percent': 4.17,
-                'current_volume': 1000000.0,
-                'average_volume': 500000.0,
-                'volume_change_ratio': 2.0,
-                'volume_ratio': 2.0,
-                'is_future': False,
-                'detected_at': datetime.now()
+                **self._TEST_MOVEMENT_TEMPLATE,
+                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now)),
+                'detected_at': now
             }
             
-            # 添加测试消息备注
-            test_movement['notes'] = "测试消息 - 验证飞书通知功能是否正常"
-            
-            # Send test notification
-            result = self.send_notification([test_movement])
+            # Send test notification synchronously so the result reflects Lark's response
+            result = self.send_notification([test_movement], block=True)
             
             if result:
                 logger.info("Test notification sent successfully!")
@@ -788,5 +1049,5 @@ class LarkNotifier:
                 
             return result
         except Exception as e:
-            logger.error(f"Error sending test notification: {str(e)}")
+            logger.error("Error sending test notification: %s", e)
             return False
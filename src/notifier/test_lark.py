@@ -6,16 +6,9 @@
 This script tests the Lark (Feishu) notification functionality.
 """
 
-import os
 import sys
 import logging
 import argparse
-import json
-import time
-from datetime import datetime
-
-# 修复导入路径问题
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from src.notifier.lark_notifier import LarkNotifier
 from src.config import settings
@@ -59,11 +52,10 @@ def main():
     logger.info(f"Using webhook URL: {webhook_url}")
     logger.info(f"Using secret: {'*' * (len(secret) if secret else 0)}")
     
-    # 创建Lark notifier实例
-    notifier = LarkNotifier(webhook_url=webhook_url, secret=secret)
-    
-    # 使用新的测试方法
-    result = notifier.test_notification()
+    # 创建Lark notifier实例，退出时释放连接池
+    with LarkNotifier(webhook_url=webhook_url, secret=secret) as notifier:
+        # 使用新的测试方法
+        result = notifier.test_notification()
     
     if result:
         logger.info("✅ Test passed! Lark notification sent successfully.")
@@ -1,13 +1,8 @@
-import os
-import sys
+import itertools
 import logging
 import time
-import schedule
 import threading
-from typing import Callable, Optional, List
-
-# 修复导入路径问题
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from typing import Any, Callable, Optional, List
 
 from src.config import settings
 
@@ -25,16 +20,38 @@ class TaskScheduler:
         self.interval_seconds = interval_seconds or settings.SCAN_INTERVAL_SECONDS
         self.running = False
         self.scheduler_thread = None
-        self.scheduled_jobs = []
+        # 每个任务为 [job_id, task_func, 下一次执行的monotonic时间]，截止时间跟随任务本身，
+        # 即使job_id重复也互不影响
+        self.scheduled_jobs: List[List[Any]] = []
+        # 调度线程与调用add_job/remove_job的线程共享scheduled_jobs
+        self._jobs_lock = threading.Lock()
+        # 自动生成的job_id单调递增，删除任务后也不会重复
+        self._job_counter = itertools.count(1)
     
     def _run_scheduler(self):
         """Run the scheduler in a separate thread."""
         self.running = True
-        logger.info(f"Starting scheduler with {self.interval_seconds}s interval")
+        logger.info("Starting scheduler with %ss interval", self.interval_seconds)
         
         while self.running:
-            schedule.run_pending()
-            time.sleep(1)
+            now = time.monotonic()
+            with self._jobs_lock:
+                due_jobs = [job for job in self.scheduled_jobs if job[2] <= now]
+            
+            # 任务在锁外执行，避免长任务阻塞add_job/remove_job
+            for job in due_jobs:
+                job_id, task_func = job[0], job[1]
+                try:
+                    task_func()
+                except Exception:
+                    logger.exception("Job '%s' raised an exception", job_id)
+                # 与之前一致，下一次执行从本次任务结束时开始计时
+                job[2] = time.monotonic() + self.interval_seconds
+            
+            # 最多睡眠1秒，保证stop()能及时生效
+            with self._jobs_lock:
+                next_deadline = min((job[2] for job in self.scheduled_jobs), default=now + 1.0)
+            time.sleep(max(0.0, min(1.0, next_deadline - time.monotonic())))
     
     def start(self):
         """Start the scheduler in a separate thread."""
@@ -55,8 +72,8 @@ class TaskScheduler:
             logger.info("Scheduler stopped")
         
         # Clear all scheduled jobs
-        schedule.clear()
-        self.scheduled_jobs = []
+        with self._jobs_lock:
+            self.scheduled_jobs = []
     
     def add_job(self, task_func: Callable, job_id: Optional[str] = None) -> str:
         """Add a new job to the scheduler.
@@ -69,12 +86,13 @@ class TaskScheduler:
             Job identifier
         """
         if not job_id:
-            job_id = f"job_{len(self.scheduled_jobs) + 1}"
+            job_id = f"job_{next(self._job_counter)}"
             
-        job = schedule.every(self.interval_seconds).seconds.do(task_func)
-        self.scheduled_jobs.append((job_id, job))
+        # 首次执行在一个间隔之后
+        with self._jobs_lock:
+            self.scheduled_jobs.append([job_id, task_func, time.monotonic() + self.interval_seconds])
         
-        logger.info(f"Added job '{job_id}' to run every {self.interval_seconds} seconds")
+        logger.info("Added job '%s' to run every %s seconds", job_id, self.interval_seconds)
         return job_id
     
     def remove_job(self, job_id: str) -> bool:
@@ -86,14 +104,14 @@ class TaskScheduler:
         Returns:
             True if job was removed, False otherwise
         """
-        for idx, (jid, job) in enumerate(self.scheduled_jobs):
-            if jid == job_id:
-                schedule.cancel_job(job)
-                self.scheduled_jobs.pop(idx)
-                logger.info(f"Removed job '{job_id}'")
-                return True
+        with self._jobs_lock:
+            for idx, job in enumerate(self.scheduled_jobs):
+                if job[0] == job_id:
+                    self.scheduled_jobs.pop(idx)
+                    logger.info("Removed job '%s'", job_id)
+                    return True
         
-        logger.warning(f"Job '{job_id}' not found")
+        logger.warning("Job '%s' not found", job_id)
         return False
     
     def list_jobs(self) -> List[str]:
@@ -102,4 +120,5 @@ class TaskScheduler:
         Returns:
             List of job identifiers
         """
-        return [job_id for job_id, _ in self.scheduled_jobs]
+        with self._jobs_lock:
+            return [job[0] for job in self.scheduled_jobs]
@@ -7,6 +7,7 @@ import traceback
 import aiohttp
 import ccxt.pro as ccxtpro
 import gc
+import weakref
 
 # 配置日志
 logging.basicConfig(
@@ -17,6 +18,9 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# 本脚本创建的aiohttp会话以及ccxt.pro交易所内部使用的会话，检查时只遍历这些会话而不是扫描整个堆
+_SESSIONS = weakref.WeakSet()
+
 async def test_ccxt_cleanup():
     """测试ccxt.pro交易所资源清理"""
     logger.info("创建交易所实例...")
@@ -45,6 +49,10 @@ async def test_ccxt_cleanup():
         logger.error(f"测试过程中出错: {str(e)}")
         logger.error(traceback.format_exc())
     finally:
+        # 登记交易所内部的aiohttp会话(正常关闭后ccxt会将其置为None)，由最终检查确认它已关闭
+        if getattr(exchange, 'session', None) is not None:
+            _SESSIONS.add(exchange.session)
+        
         # 验证资源清理
         tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
         logger.info(f"剩余任务数: {len(tasks)}")
@@ -60,6 +68,7 @@ async def test_aiohttp_cleanup():
     """测试aiohttp会话资源清理"""
     logger.info("创建aiohttp会话...")
     session = aiohttp.ClientSession()
+    _SESSIONS.add(session)
     
     try:
         # 发送一个请求
@@ -78,9 +87,9 @@ async def test_aiohttp_cleanup():
         logger.error(traceback.format_exc())
     finally:
         # 验证资源清理
-        for obj in gc.get_objects():
-            if isinstance(obj, aiohttp.ClientSession) and not obj.closed:
-                logger.warning(f"发现未关闭的ClientSession: {obj}")
+        for s in list(_SESSIONS):
+            if not s.closed:
+                logger.warning(f"发现未关闭的ClientSession: {s}")
 
 async def main():
     """主测试函数"""
@@ -111,11 +120,11 @@ async def main():
     # 检查aiohttp会话
     gc.collect()  # 强制垃圾回收
     sessions_found = False
-    for obj in gc.get_objects():
-        if isinstance(obj, aiohttp.ClientSession) and not obj.closed:
+    for s in list(_SESSIONS):
+        if not s.closed:
             sessions_found = True
-            logger.warning(f"发现未关闭的ClientSession: {obj}")
-            await obj.close()
+            logger.warning(f"发现未关闭的ClientSession: {s}")
+            await s.close()
     
     if not sessions_found:
         logger.info("没有发现未关闭的ClientSession")
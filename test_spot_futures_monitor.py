@@ -6,16 +6,11 @@
 用于测试和验证现货与期货之间的价差监控功能
 """
 
-import os
 import sys
 import logging
 import asyncio
 from datetime import datetime
 
-# 将项目根目录添加到Python路径
-project_root = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(project_root)
-
 from src.config import settings
 from src.fetcher.async_data_fetcher import AsyncMarketDataFetcher
 from src.analyzer.spot_futures_monitor import SpotFuturesMonitor
@@ -114,7 +109,7 @@ async def test_spot_futures_monitoring():
             
             # 发送通知
             logger.info("正在发送飞书通知...")
-            notification_success = notifier.send_notification(spot_futures_alerts)
+            notification_success = await notifier.send_notification_async(spot_futures_alerts)
             
             if notification_success:
                 logger.info("飞书通知发送成功")
@@ -132,6 +127,8 @@ async def test_spot_futures_monitoring():
         logger.info("正在关闭交易所连接...")
         if 'data_fetcher' in locals():
             await data_fetcher.close_all()
+        if 'notifier' in locals():
+            await notifier.aclose()
         logger.info("测试完成")
 
 if __name__ == "__main__":